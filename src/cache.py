@@ -0,0 +1,96 @@
+import os
+import zlib
+import hashlib
+from typing import Optional
+
+from src.constants import (
+    CACHE_FILES_DIRECTORY,
+    CACHE_FILE_EXTENSION,
+    FULLTEXT_CACHE_VERSION,
+    FULLTEXT_CACHE_SEPARATOR,
+    REMOVE_NUMBERS,
+    COMBINE_SPLITWORDS,
+    SEPARATE_DOUBLEWORDS,
+    SPLIT_BY_FREQUENCY,
+    MIN_DOUBLEWORD_LENGTH,
+    INVALID_WORD_RATIO,
+    DOUBLEWORD_SEPARATOR,
+    REPAIR_OCR_WORDS,
+    MAX_REPAIR_DISTANCE,
+    FILTER_DUPLICATE_POINTS,
+    SHINGLE_SIZE,
+    MINHASH_PERMUTATIONS,
+    LSH_BANDS,
+    DUPLICATE_THRESHOLD,
+)
+from src.duplicates import get_duplicate_sources_state, load_duplicate_filter
+from src.parsing import parse_fulltext_lines
+
+def get_parser_config(repair: bool) -> tuple:
+    return (
+        FULLTEXT_CACHE_VERSION,
+        REMOVE_NUMBERS,
+        COMBINE_SPLITWORDS,
+        SEPARATE_DOUBLEWORDS,
+        SPLIT_BY_FREQUENCY,
+        MIN_DOUBLEWORD_LENGTH,
+        INVALID_WORD_RATIO,
+        DOUBLEWORD_SEPARATOR,
+        repair and MAX_REPAIR_DISTANCE,
+    )
+
+def get_fulltext_cache_key(text: str, repair: bool) -> str:
+    digest = hashlib.blake2b(text.encode(), digest_size=16)
+    digest.update(repr(get_parser_config(repair)).encode())
+    return digest.hexdigest()
+
+def get_filtered_fulltext_cache_key(cache_key: str) -> str:
+    digest = hashlib.blake2b(cache_key.encode(), digest_size=16)
+    filter_config = (SHINGLE_SIZE, MINHASH_PERMUTATIONS, LSH_BANDS, DUPLICATE_THRESHOLD)
+    digest.update(repr(filter_config).encode())
+    return digest.hexdigest()
+
+def get_duplicate_sources_digest() -> str:
+    state = repr(get_duplicate_sources_state()).encode()
+    return hashlib.blake2b(state, digest_size=16).hexdigest()
+
+def get_fulltext_cache_filepath(cache_key: str) -> str:
+    return os.path.join(CACHE_FILES_DIRECTORY, cache_key + CACHE_FILE_EXTENSION)
+
+def load_cached_fulltext(cache_key: str) -> Optional[list[str]]:
+    cache_filepath = get_fulltext_cache_filepath(cache_key)
+    if not os.path.isfile(cache_filepath):
+        return None
+    with open(cache_filepath, "rb") as cache_file:
+        data = zlib.decompress(cache_file.read()).decode()
+    return data.split(FULLTEXT_CACHE_SEPARATOR) if data else []
+
+def save_cached_fulltext(cache_key: str, lines: list[str]):
+    if not os.path.exists(CACHE_FILES_DIRECTORY):
+        os.mkdir(CACHE_FILES_DIRECTORY)
+    cache_filepath = get_fulltext_cache_filepath(cache_key)
+    data = zlib.compress(FULLTEXT_CACHE_SEPARATOR.join(lines).encode())
+    temporary_filepath = cache_filepath + f".{os.getpid()}"
+    with open(temporary_filepath, "wb") as cache_file:
+        cache_file.write(data)
+    os.replace(temporary_filepath, cache_filepath)
+
+def parse_fulltext_cached(text: str, filter_duplicates: bool = FILTER_DUPLICATE_POINTS,
+                          repair: bool = REPAIR_OCR_WORDS) -> list[str]:
+    cache_key = get_fulltext_cache_key(text, repair)
+    if filter_duplicates:
+        filtered_cache_key = get_filtered_fulltext_cache_key(cache_key)
+        sources_digest = get_duplicate_sources_digest()
+        cached_entry = load_cached_fulltext(filtered_cache_key)
+        if cached_entry and cached_entry[0] == sources_digest:
+            return cached_entry[1:]
+
+    if (parsed_lines := load_cached_fulltext(cache_key)) is None:
+        parsed_lines = parse_fulltext_lines(text, repair)
+        save_cached_fulltext(cache_key, parsed_lines)
+
+    if not filter_duplicates:
+        return parsed_lines
+    filtered_lines = load_duplicate_filter().filter(parsed_lines)
+    save_cached_fulltext(filtered_cache_key, [sources_digest] + filtered_lines)
+    return filtered_lines
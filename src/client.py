@@ -0,0 +1,72 @@
+import os
+import sys
+import json
+import socket
+from typing import Any, Optional
+
+DEFAULT_SOCKET_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "vocabulary.sock")
+MESSAGE_SEPARATOR = b"\n"
+
+def encode_message(message: dict) -> bytes:
+    return json.dumps(message).encode() + MESSAGE_SEPARATOR
+
+def decode_message(line: bytes) -> dict:
+    return json.loads(line)
+
+class VocabularyClient:
+
+    def __init__(self, socket_path: str = DEFAULT_SOCKET_PATH):
+        self._socket_path = socket_path
+        self._socket: Optional[socket.socket] = None
+        self._reader = None
+
+    def __enter__(self) -> "VocabularyClient":
+        self.connect()
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    def connect(self):
+        self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._socket.connect(self._socket_path)
+        self._reader = self._socket.makefile("rb")
+
+    def close(self):
+        if self._socket is not None:
+            self._reader.close()
+            self._socket.close()
+            self._socket = self._reader = None
+
+    def request(self, command: str, text: str = "") -> Any:
+        if self._socket is None:
+            self.connect()
+        self._socket.sendall(encode_message({"command": command, "text": text}))
+        response = decode_message(self._reader.readline())
+        if "error" in response:
+            raise RuntimeError(response["error"])
+        return response["result"]
+
+    def parse_text(self, text: str) -> str:
+        return self.request("parse_text", text)
+
+    def count_words(self, text: str) -> dict[str, int]:
+        return self.request("count_words", text)
+
+    def parse_fulltext(self, text: str) -> list[str]:
+        return self.request("parse_fulltext", text)
+
+    def segment(self, token: str) -> Optional[str]:
+        return self.request("segment", token)
+
+def main():
+    if len(sys.argv) < 2:
+        print("Usage: python -m src.client <command> [file]")
+        return
+    command, *paths = sys.argv[1:]
+    text = open(paths[0]).read() if paths else sys.stdin.read()
+    with VocabularyClient() as client:
+        print(json.dumps(client.request(command, text), indent=2))
+
+if __name__ == "__main__":
+    main()
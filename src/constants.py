@@ -10,13 +10,20 @@ os.chdir(FOLDER_DIR)
 SAVED_FILE_PREFIX = "saved"
 SAVED_FILES_DIRECTORY = os.path.join(FOLDER_DIR, SAVED_FILE_PREFIX)
 POINT_FILES_DIRECTORY = os.path.join(FOLDER_DIR, "points")
+INDEX_FILES_DIRECTORY = os.path.join(FOLDER_DIR, "index")
+CACHE_FILES_DIRECTORY = os.path.join(FOLDER_DIR, "cache")
 
 DOUBLEWORD_SEPARATOR = ' '
 FILENAME_SEPARATOR = '-'
 
 DEFAULT_WORD_COUNTS_FILENAME = "word_counts"
 WORD_COUNTS_FILENAME = "word_counts.txt"
+LEMMAS_FILENAME = "lemmas.txt"
 JSTOR_FILE = "bad_jstor.txt"
+INDEX_FILE_EXTENSION = ".index"
+COUNTS_FILE_EXTENSION = ".counts"
+EXTRACTOR_FILE_EXTENSION = ".extractor"
+CACHE_FILE_EXTENSION = ".cache"
 
 TXT = "txt"
 FILE_EXTENSION = ".txt"
@@ -24,6 +31,7 @@ PDF_FILE_EXTENSION = ".pdf"
 GPT_SUFFIX = GPT_PREFIX = "gpt"
 
 REMOVABLE_CHARACTERS = punctuation + digits
+ASCII_WHITESPACE = " \t\n\r\x0b\x0c\x1c\x1d\x1e\x1f"
 WORDS_CORPUS = frozenset(map(str.lower, words.words()))
 
 BLANK = ''
@@ -53,10 +61,35 @@ COMMAND_MAPPING = {
     "preview": (1, str.isdigit),
 }
 
+THREAD_EXECUTOR = "thread"
+PROCESS_EXECUTOR = "process"
+PROCESS_START_METHOD = "forkserver"
+PIPELINE_QUEUE_SIZE = 8
+PIPELINE_STAGE_CONFIG = {
+    "scan": (1, THREAD_EXECUTOR),
+    "read": (2, THREAD_EXECUTOR),
+    "extract": (os.cpu_count() or 1, PROCESS_EXECUTOR),
+    "parse": (2, PROCESS_EXECUTOR),
+    "count": (2, PROCESS_EXECUTOR),
+    "persist": (1, THREAD_EXECUTOR),
+}
+DEFAULT_PDF_EXTRACTOR = "pypdf"
+CALIBRATION_SAMPLE_SIZE = 5
+MIN_EXTRACTOR_AGREEMENT = 0.9
+
+MEMORY_TOP_ALLOCATIONS = 5
+MEMORY_TRACEBACK_LIMIT = 1
+
+WATCH_POLL_INTERVAL = 1.0
+WATCH_SETTLE_TIME = 2.0
+
 REMOVE_NUMBERS = True
 COMBINE_SPLITWORDS = True
 SEPARATE_DOUBLEWORDS = True
 SPLIT_BY_FREQUENCY = True
+FILTER_DUPLICATE_POINTS = True
+REPAIR_OCR_WORDS = False
+LEMMATIZE_WORDS = False
 
 GREEN = Back.GREEN
 RED = Back.RED
@@ -68,6 +101,76 @@ INCOMPLETE_COLOUR = RED
 SIDE_QUEST_COLOUR = BLUE
 
 MIN_DOUBLEWORD_LENGTH = 5
+DEFAULT_RARE_WORD_RANK = 10000
+CONCORDANCE_WIDTH = 60
+SHINGLE_SIZE = 3
+MINHASH_PERMUTATIONS = 32
+LSH_BANDS = 8
+SIGNATURE_BATCH_SIZE = 256
+DUPLICATE_THRESHOLD = 0.8
+MAX_REPAIR_DISTANCE = 1
+REPAIR_PREFIX_LENGTH = 7
+MIN_REPAIR_LENGTH = 4
+REPAIR_CACHE_SIZE = 100000
+MIN_LEMMA_LENGTH = 3
+LEMMA_SUFFIX_RULES = (
+    ("ies", "y"),
+    ("ied", "y"),
+    ("ing", ""),
+    ("ing", "e"),
+    ("s", ""),
+    ("es", ""),
+    ("ed", ""),
+    ("ed", "e"),
+)
+INFLECTED_STEM_SUFFIXES = ("ing", "ed")
+PLURAL_EXCLUDED_STEM_ENDINGS = ("s", "u", "i", "o")
+SIBILANT_STEM_ENDINGS = ("s", "x", "z", "ch", "sh", "o")
+UNDOUBLED_CONSONANTS = "wxy"
+LEMMA_EXCEPTIONS = {
+    "does": "do",
+    "did": "do",
+    "done": "do",
+    "has": "have",
+    "had": "have",
+    "is": "be",
+    "was": "be",
+    "were": "be",
+    "been": "be",
+    "news": "news",
+    "always": "always",
+    "sometimes": "sometimes",
+    "series": "series",
+    "species": "species",
+    "during": "during",
+    "evening": "evening",
+    "morning": "morning",
+    "nothing": "nothing",
+    "something": "something",
+    "anything": "anything",
+    "everything": "everything",
+}
+WORDNET_POS_ORDER = ("v", "n", "a", "r")
+LEMMA_TABLE_VERSION = 2
+WORDNET_RESOURCE = "corpora/wordnet"
+WORDNET_LEMMA_BUILDER = "wordnet"
+RULES_LEMMA_BUILDER = "rules"
+SENTENCE_BREAK_CHARACTERS = ".,;:!?"
+PMI_MEASURE = "pmi"
+LLR_MEASURE = "llr"
+BIGRAM_MIN_COUNT = 3
+BIGRAM_MAX_PAIRS = 2000000
+SKETCH_WIDTH = 1 << 20
+SKETCH_DEPTH = 4
+COLLOCATION_TOP_K = 10000
+MAX_DOCUMENT_FREQUENCY_RATIO = 0.5
+MIN_DOCUMENTS_FOR_FREQUENCY_CUTOFF = 20
+MAX_DOCUMENT_TERMS = 200
+SIMILARITY_BLOCK_SIZE = 512
+SIMILARITY_NEIGHBOURS = 10
+CLUSTER_THRESHOLD = 0.3
+FULLTEXT_CACHE_VERSION = 1
+FULLTEXT_CACHE_SEPARATOR = '\0'
 PROGRESS_BAR_LENGTH = 50
 MAX_GPT_CHARACTERS = 4096
 INVALID_WORD_RATIO = 0.5
\ No newline at end of file
@@ -0,0 +1,118 @@
+import threading
+from typing import Optional
+
+from src.constants import (
+    MAX_REPAIR_DISTANCE,
+    REPAIR_PREFIX_LENGTH,
+    MIN_REPAIR_LENGTH,
+    REPAIR_CACHE_SIZE,
+)
+from src.processing import WORD_COUNTS
+
+def generate_deletes(word: str, max_distance: int) -> set[str]:
+    deletes = set()
+    edges = {word}
+    for _ in range(max_distance):
+        next_edges = set()
+        for edge in edges:
+            if len(edge) <= 1:
+                continue
+            for i in range(len(edge)):
+                if (delete := edge[:i] + edge[i + 1:]) not in deletes:
+                    deletes.add(delete)
+                    next_edges.add(delete)
+        edges = next_edges
+    return deletes
+
+def get_edit_distance(word: str, other_word: str, max_distance: int) -> Optional[int]:
+    if abs(len(word) - len(other_word)) > max_distance:
+        return None
+
+    previous_previous_row = None
+    previous_row = list(range(len(other_word) + 1))
+    for i, character in enumerate(word, 1):
+        row = [i] + [0] * len(other_word)
+        for j, other_character in enumerate(other_word, 1):
+            row[j] = min(
+                previous_row[j] + 1,
+                row[j - 1] + 1,
+                previous_row[j - 1] + (character != other_character),
+            )
+            if (
+                previous_previous_row is not None and j > 1
+                and character == other_word[j - 2] and word[i - 2] == other_character
+            ):
+                row[j] = min(row[j], previous_previous_row[j - 2] + 1)
+        if min(row) > max_distance:
+            return None
+        previous_previous_row, previous_row = previous_row, row
+
+    distance = previous_row[-1]
+    return distance if distance <= max_distance else None
+
+class SpellChecker:
+
+    def __init__(self, word_counts: dict[str, int], max_distance: int = MAX_REPAIR_DISTANCE,
+                 prefix_length: int = REPAIR_PREFIX_LENGTH, cache_size: int = REPAIR_CACHE_SIZE):
+        self._max_distance = max_distance
+        self._prefix_length = prefix_length
+        self._cache_size = cache_size
+        self._cache: dict[str, Optional[str]] = {}
+        self._word_counts = word_counts
+        self._words = list(word_counts)
+        self._deletes: dict[str, list[int]] = {}
+
+        for word_id, word in enumerate(self._words):
+            prefix = word[:prefix_length]
+            for delete in generate_deletes(prefix, max_distance) | {prefix}:
+                if (word_ids := self._deletes.get(delete)) is None:
+                    self._deletes[delete] = [word_id]
+                else:
+                    word_ids.append(word_id)
+
+    def get_candidates(self, word: str) -> set[str]:
+        prefix = word[:self._prefix_length]
+        word_ids = set()
+        for delete in generate_deletes(prefix, self._max_distance) | {prefix}:
+            word_ids.update(self._deletes.get(delete, ()))
+        return {self._words[word_id] for word_id in word_ids}
+
+    def find_correction(self, word: str) -> Optional[str]:
+        if word in self._word_counts:
+            return word
+
+        best_word = None
+        best_key = None
+        for candidate in self.get_candidates(word):
+            distance = get_edit_distance(word, candidate, self._max_distance)
+            if distance is None:
+                continue
+            key = (distance, -self._word_counts[candidate], candidate)
+            if best_key is None or key < best_key:
+                best_word, best_key = candidate, key
+        return best_word
+
+    def correct(self, word: str) -> Optional[str]:
+        if len(word) < MIN_REPAIR_LENGTH:
+            return None
+        if word in self._cache:
+            return self._cache[word]
+
+        correction = self.find_correction(word)
+        if len(self._cache) >= self._cache_size:
+            self._cache.clear()
+        self._cache[word] = correction
+        return correction
+
+_spell_checker: Optional[SpellChecker] = None
+_spell_checker_lock = threading.Lock()
+
+def get_spell_checker() -> SpellChecker:
+    global _spell_checker
+    with _spell_checker_lock:
+        if _spell_checker is None:
+            _spell_checker = SpellChecker(WORD_COUNTS)
+    return _spell_checker
+
+def repair_word(word: str) -> Optional[str]:
+    return get_spell_checker().correct(word.lower())
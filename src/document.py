@@ -1,25 +1,126 @@
+import io
 import os
+import pickle
+import random
+import shutil
+import subprocess
+import importlib.util
 import threading
+import time
 import concurrent.futures
 from collections import Counter
-from typing import Callable, Generator, Optional
+from functools import partial
+from typing import BinaryIO, Callable, Generator, Optional, Union
 
 from pypdf import PdfReader
 
 from src.constants import (
     TXT, 
     FOLDER_DIR,
+    DEFAULT_RARE_WORD_RANK,
     FILENAME_SEPARATOR, 
+    DEFAULT_PDF_EXTRACTOR,
+    CALIBRATION_SAMPLE_SIZE,
+    MIN_EXTRACTOR_AGREEMENT,
 )
+from src.patterns import WORD_SEARCH_PATTERN
 from src.processing import (
     is_pdf, 
     is_txt, 
     get_word_counts_output_path,
+    get_document_counts_filepath,
+    get_extractor_filepath,
+    make_index_files_directory,
     get_file_count,
     log_time,
     clear_screen
 )
-from src.parsing import count_words, parse_text
+from src.parsing import count_words, count_parsed_words, parse_text
+from src.pipeline import Pipeline, Stage
+from src.profiling import MemoryProfiler
+from src.frequency import FREQUENCY_INDEX
+from src.lemmas import lemmatize_word_counts
+from src.similarity import SimilarityIndex
+
+class PDFExtractor:
+
+    name = ""
+    module_name: Optional[str] = None
+
+    @classmethod
+    def is_available(cls) -> bool:
+        return cls.module_name is None or importlib.util.find_spec(cls.module_name) is not None
+
+    def extract_text(self, data: bytes) -> str:
+        raise NotImplementedError
+
+class PypdfExtractor(PDFExtractor):
+
+    name = "pypdf"
+
+    def extract_text(self, data: bytes) -> str:
+        reader = PdfReader(io.BytesIO(data))
+        return "".join(page.extract_text() for page in reader.pages)
+
+class PymupdfExtractor(PDFExtractor):
+
+    name = "pymupdf"
+    module_name = "pymupdf"
+
+    def extract_text(self, data: bytes) -> str:
+        import pymupdf
+        with pymupdf.open(stream=data, filetype="pdf") as document:
+            return "".join(page.get_text() for page in document)
+
+class PdfiumExtractor(PDFExtractor):
+
+    name = "pdfium"
+    module_name = "pypdfium2"
+
+    def extract_text(self, data: bytes) -> str:
+        import pypdfium2
+        document = pypdfium2.PdfDocument(data)
+        try:
+            return "".join(page.get_textpage().get_text_range() for page in document)
+        finally:
+            document.close()
+
+class PdftotextExtractor(PDFExtractor):
+
+    name = "pdftotext"
+
+    @classmethod
+    def is_available(cls) -> bool:
+        return shutil.which(cls.name) is not None
+
+    def extract_text(self, data: bytes) -> str:
+        process = subprocess.run(
+            [self.name, "-q", "-enc", "UTF-8", "-", "-"], 
+            input=data, capture_output=True, check=True
+        )
+        return process.stdout.decode(errors="replace")
+
+PDF_EXTRACTORS: dict[str, type[PDFExtractor]] = {
+    extractor.name: extractor 
+    for extractor in (PypdfExtractor, PymupdfExtractor, PdfiumExtractor, PdftotextExtractor)
+}
+
+def get_available_extractors() -> list[str]:
+    return [name for name, extractor in PDF_EXTRACTORS.items() if extractor.is_available()]
+
+def extract_pdf_text(stream: Union[BinaryIO, bytes], 
+                     extractor_name: str = DEFAULT_PDF_EXTRACTOR) -> str:
+    if not isinstance(stream, bytes):
+        stream = stream.read()
+    return PDF_EXTRACTORS[extractor_name]().extract_text(stream)
+
+def get_text_agreement(text: str, reference_text: str) -> float:
+    words = Counter(WORD_SEARCH_PATTERN.findall(text.lower()))
+    reference_words = Counter(WORD_SEARCH_PATTERN.findall(reference_text.lower()))
+    n_union = sum((words | reference_words).values())
+    if n_union == 0:
+        return 1.0
+    return sum((words & reference_words).values()) / n_union
 
 class DocumentProcessor:
 
@@ -31,7 +132,9 @@ class DocumentProcessor:
 
         self._file_count = 0
         self._word_counts = Counter()
+        self._document_word_counts: dict[str, Counter] = {}
         self._filename_generator: Optional[Callable] = None
+        self._extractor_name = self.load_extractor_name()
 
     @property
     def txt_folder_path(self) -> str:
@@ -58,13 +161,87 @@ class DocumentProcessor:
 
     def get_formatted_pdf_text(self, filename: str) -> str:
         binary_file = self.get_binary_file_contents(filename)
-        reader = PdfReader(binary_file)
-        text = "".join(page.extract_text() for page in reader.pages)
+        text = extract_pdf_text(binary_file, self._extractor_name)
         binary_file.close()
         return parse_text(text)
 
+    def load_extractor_name(self) -> str:
+        filepath = get_extractor_filepath(self._folder_name)
+        if os.path.isfile(filepath):
+            with open(filepath) as extractor_file:
+                extractor_name = extractor_file.read().strip()
+            if extractor_name in PDF_EXTRACTORS and PDF_EXTRACTORS[extractor_name].is_available():
+                return extractor_name
+        return DEFAULT_PDF_EXTRACTOR
+
+    def set_extractor_name(self, extractor_name: str):
+        self._extractor_name = extractor_name
+        make_index_files_directory()
+        with open(get_extractor_filepath(self._folder_name), "w") as extractor_file:
+            extractor_file.write(extractor_name + "\n")
+
+    def calibrate_extractors(self, sample_size: int = CALIBRATION_SAMPLE_SIZE) -> str:
+        pdf_filenames = sorted(self.generate_pdf_filenames())
+        if not pdf_filenames:
+            return self._extractor_name
+        sample_filenames = random.Random(0).sample(
+            pdf_filenames, min(sample_size, len(pdf_filenames))
+        )
+        samples = [self.read_pdf_file(filename)[1] for filename in sample_filenames]
+        n_pages = sum(len(PdfReader(io.BytesIO(data)).pages) for data in samples)
+
+        extractor_names = [DEFAULT_PDF_EXTRACTOR] + [
+            extractor_name for extractor_name in get_available_extractors()
+            if extractor_name != DEFAULT_PDF_EXTRACTOR
+        ]
+        results = {}
+        reference_texts = None
+        for extractor_name in extractor_names:
+            extractor = PDF_EXTRACTORS[extractor_name]()
+            try:
+                extractor.extract_text(samples[0])
+                start_time = time.perf_counter()
+                texts = [extractor.extract_text(data) for data in samples]
+            except Exception as error:
+                print(f"Extractor {extractor_name!r} failed: {error}")
+                if reference_texts is None:
+                    print(f"Skipping extractor selection, keeping {self._extractor_name!r}.")
+                    return self._extractor_name
+                continue
+            elapsed_time = max(time.perf_counter() - start_time, 1e-9)
+
+            if reference_texts is None:
+                reference_texts = texts
+            agreements = [
+                get_text_agreement(text, reference_text)
+                for text, reference_text in zip(texts, reference_texts)
+            ]
+            agreement = sum(agreements) / len(agreements) if agreements else 1.0
+            results[extractor_name] = (n_pages / elapsed_time, agreement)
+            print(f"{extractor_name}: {n_pages / elapsed_time:.1f} pages/s, "
+                  f"{agreement:.1%} agreement with {DEFAULT_PDF_EXTRACTOR}")
+
+        eligible_results = {
+            extractor_name: pages_per_second
+            for extractor_name, (pages_per_second, agreement) in results.items()
+            if agreement >= MIN_EXTRACTOR_AGREEMENT
+        }
+        extractor_name = max(
+            eligible_results, key=eligible_results.get, default=DEFAULT_PDF_EXTRACTOR
+        )
+        self.set_extractor_name(extractor_name)
+        print(f"Selected extractor {extractor_name!r} for {self._folder_name!r}.")
+        return extractor_name
+
+    def read_pdf_file(self, filename: str) -> tuple[str, bytes]:
+        with self.get_binary_file_contents(filename) as binary_file:
+            return filename, binary_file.read()
+
+    def get_txt_file_path(self, filename: str) -> str:
+        return os.path.join(self._txt_folder_path, filename)
+
     def get_txt_file_text(self, filename: str) -> str:
-        filepath = os.path.join(self._txt_folder_path, filename)
+        filepath = self.get_txt_file_path(filename)
         return open(filepath).read()
     
     def write_word_counts_to_file(self):
@@ -75,9 +252,57 @@ class DocumentProcessor:
                 word_counts_file.write(f"{word},{count}\n")
         print("Finished writing to file.")
 
-    def add_word_counts(self, words: Counter):
+    def add_word_counts(self, words: Counter, filename: Optional[str] = None):
+        if filename is not None:
+            if (previous_words := self._document_word_counts.get(filename)) is not None:
+                self._word_counts -= previous_words
+            self._document_word_counts[filename] = words
         self._word_counts.update(words)
 
+    def get_word_counts(self) -> Counter:
+        return self._word_counts
+
+    def write_document_word_counts(self):
+        make_index_files_directory()
+        filepath = get_document_counts_filepath(self._folder_name)
+        document_word_counts = {
+            filename: dict(words) for filename, words in self._document_word_counts.items()
+        }
+        with open(filepath, "wb") as counts_file:
+            pickle.dump(document_word_counts, counts_file, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def load_document_word_counts(self) -> bool:
+        filepath = get_document_counts_filepath(self._folder_name)
+        if not os.path.isfile(filepath):
+            return False
+        with open(filepath, "rb") as counts_file:
+            document_word_counts = pickle.load(counts_file)
+        for filename, words in document_word_counts.items():
+            self.add_word_counts(Counter(words), filename)
+        return True
+
+    def get_similarity_index(self) -> SimilarityIndex:
+        if not self._document_word_counts and not self.load_document_word_counts():
+            self.count_words(write_to_file=False)
+        return SimilarityIndex(self._document_word_counts)
+
+    def get_lemma_counts(self) -> Counter:
+        return lemmatize_word_counts(self._word_counts)
+
+    def get_document_word_counts(self, filename: str) -> Counter:
+        return self._document_word_counts[filename]
+
+    def get_rare_words(self, filename: Optional[str] = None, 
+                       min_rank: int = DEFAULT_RARE_WORD_RANK) -> list[tuple[str, int, float]]:
+        if filename is None:
+            return FREQUENCY_INDEX.rare_words(self._word_counts, min_rank)
+        return FREQUENCY_INDEX.rare_words(self._document_word_counts[filename], min_rank)
+
+    def get_rare_words_by_document(
+        self, min_rank: int = DEFAULT_RARE_WORD_RANK
+    ) -> dict[str, list[tuple[str, int, float]]]:
+        return FREQUENCY_INDEX.rare_words_by_document(self._document_word_counts, min_rank)
+
     def preview_files(self):
         file_names = self._filename_generator()
         for file_number, filename in enumerate(file_names, 1):
@@ -107,16 +332,48 @@ class DocumentProcessor:
             thread.join()
 
         if write_to_file:
-            self.write_to_file()
+            self.write_word_counts_to_file()
+
+    def persist_word_counts(self, item: tuple[str, Counter]):
+        filename, words = item
+        self.add_word_counts(words, filename)
+
+    def get_pipeline_stages(self) -> list[Stage]:
+        raise NotImplementedError
+
+    @log_time
+    def count_words_pipelined(self, write_to_file: bool = True, 
+                              report_interval: Optional[float] = None):
+        pipeline = Pipeline(self.get_pipeline_stages())
+        pipeline.run([self._folder_path], report_interval)
+        for line in pipeline.get_stage_report():
+            print(line)
+        self.write_document_word_counts()
+
+        if write_to_file:
+            self.write_word_counts_to_file()
+
+    def get_profiled_stages(self) -> list[Stage]:
+        return [stage for stage in self.get_pipeline_stages() if stage.name != "persist"]
+
+    @log_time
+    def profile_memory(self) -> MemoryProfiler:
+        pipeline = Pipeline(self.get_profiled_stages())
+        with MemoryProfiler() as profiler:
+            pipeline.run_sequentially([self._folder_path], profiler)
+        for line in profiler.get_report():
+            print(line)
+        return profiler
 
     @log_time
     def count_words(self, write_to_file: bool = True):
         with concurrent.futures.ThreadPoolExecutor() as executor:
             file_names = self._filename_generator()
             executor.map(self.process_file, file_names)
+        self.write_document_word_counts()
 
         if write_to_file:
-            self.write_to_file()
+            self.write_word_counts_to_file()
 
 class PDFProcessor(DocumentProcessor):
 
@@ -130,4 +387,16 @@ class PDFProcessor(DocumentProcessor):
         print(f"Processing file {self._file_count}/{self._file_count}")
         pdf_text = self.get_formatted_pdf_text(filename)
         words = count_words(pdf_text)
-        self.add_word_counts(words)
\ No newline at end of file
+        self.add_word_counts(words, filename)
+
+    def get_pipeline_stages(self) -> list[Stage]:
+        return [
+            Stage.configured("scan", lambda _: self._filename_generator(), 
+                             keyed=False, fan_out=True),
+            Stage.configured("read", self.read_pdf_file, keyed=False),
+            Stage.configured("extract", partial(extract_pdf_text, 
+                                                extractor_name=self._extractor_name)),
+            Stage.configured("parse", parse_text),
+            Stage.configured("count", count_parsed_words),
+            Stage.configured("persist", self.persist_word_counts, keyed=False),
+        ]
\ No newline at end of file
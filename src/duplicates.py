@@ -0,0 +1,158 @@
+import os
+import zlib
+from collections import defaultdict
+from itertools import chain, islice
+from typing import Iterable, Optional
+
+import numpy as np
+
+from src.constants import (
+    SPACE,
+    POINT_PREFIX,
+    JSTOR_FILE,
+    POINT_FILES_DIRECTORY,
+    SHINGLE_SIZE,
+    MINHASH_PERMUTATIONS,
+    LSH_BANDS,
+    DUPLICATE_THRESHOLD,
+    SIGNATURE_BATCH_SIZE,
+)
+from src.patterns import WORD_SEARCH_PATTERN
+from src.processing import get_files_in_directory
+
+HASH_PRIME = (1 << 32) - 5
+
+def generate_shingles(line: str, shingle_size: int = SHINGLE_SIZE) -> set[int]:
+    words = WORD_SEARCH_PATTERN.findall(line.lower())
+    if len(words) <= shingle_size:
+        return {zlib.crc32(SPACE.join(words).encode())} if words else set()
+    return {
+        zlib.crc32(SPACE.join(words[i:i + shingle_size]).encode())
+        for i in range(len(words) - shingle_size + 1)
+    }
+
+class DuplicateFilter:
+
+    def __init__(self, n_permutations: int = MINHASH_PERMUTATIONS, n_bands: int = LSH_BANDS,
+                 threshold: float = DUPLICATE_THRESHOLD, seed: int = 1):
+        assert n_permutations % n_bands == 0, "Bands must divide the number of permutations"
+        generator = np.random.default_rng(seed)
+        self._multipliers = generator.integers(1, HASH_PRIME, n_permutations, dtype=np.uint64)
+        self._increments = generator.integers(0, HASH_PRIME, n_permutations, dtype=np.uint64)
+        self._n_bands = n_bands
+        self._rows = n_permutations // n_bands
+        self._threshold = threshold
+        self._signatures: list[np.ndarray] = []
+        self._exact_lines: set[frozenset[int]] = set()
+        self._buckets: defaultdict[tuple[int, bytes], list[int]] = defaultdict(list)
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def get_signatures(self, shingle_sets: list[set[int]]) -> np.ndarray:
+        lengths = [len(shingles) for shingles in shingle_sets]
+        shingles = np.fromiter(
+            chain.from_iterable(shingle_sets), dtype=np.uint64, count=sum(lengths)
+        )
+        hashes = (self._multipliers[:, None] * shingles + self._increments[:, None]) % HASH_PRIME
+        offsets = np.cumsum([0] + lengths[:-1])
+        return np.minimum.reduceat(hashes, offsets, axis=1).T
+
+    def generate_signed_lines(self, lines: Iterable[str]) -> Iterable[tuple[str, set[int], Optional[np.ndarray]]]:
+        lines = iter(lines)
+        while batch := list(islice(lines, SIGNATURE_BATCH_SIZE)):
+            shingle_sets = [generate_shingles(line) for line in batch]
+            signed_sets = [shingles for shingles in shingle_sets if shingles]
+            signatures = iter(self.get_signatures(signed_sets) if signed_sets else ())
+            for line, shingles in zip(batch, shingle_sets):
+                yield line, shingles, next(signatures) if shingles else None
+
+    def generate_band_keys(self, signature: np.ndarray) -> Iterable[tuple[int, bytes]]:
+        for band in range(self._n_bands):
+            start = band * self._rows
+            yield band, signature[start:start + self._rows].tobytes()
+
+    def add_signature(self, shingles: set[int], signature: np.ndarray):
+        self._exact_lines.add(frozenset(shingles))
+        line_id = len(self._signatures)
+        self._signatures.append(signature)
+        for band_key in self.generate_band_keys(signature):
+            self._buckets[band_key].append(line_id)
+
+    def add(self, line: str):
+        self.add_lines([line])
+
+    def add_lines(self, lines: Iterable[str]):
+        for _, shingles, signature in self.generate_signed_lines(lines):
+            if signature is not None:
+                self.add_signature(shingles, signature)
+
+    def filter(self, lines: Iterable[str]) -> list[str]:
+        unique_lines = []
+        for line, shingles, signature in self.generate_signed_lines(lines):
+            if signature is None:
+                unique_lines.append(line)
+            elif not self.matches_signature(shingles, signature):
+                self.add_signature(shingles, signature)
+                unique_lines.append(line)
+        return unique_lines
+
+    def is_duplicate(self, line: str) -> bool:
+        _, shingles, signature = next(self.generate_signed_lines([line]))
+        return signature is not None and self.matches_signature(shingles, signature)
+
+    def matches_signature(self, shingles: set[int], signature: np.ndarray) -> bool:
+        if frozenset(shingles) in self._exact_lines:
+            return True
+
+        n_permutations = len(signature)
+        checked_ids = set()
+        for band_key in self.generate_band_keys(signature):
+            for line_id in self._buckets.get(band_key, ()):
+                if line_id in checked_ids:
+                    continue
+                checked_ids.add(line_id)
+                n_equal = np.count_nonzero(signature == self._signatures[line_id])
+                if n_equal / n_permutations >= self._threshold:
+                    return True
+        return False
+
+def format_point_line(point: str) -> str:
+    return POINT_PREFIX + SPACE.join(point.split()) + "\n"
+
+def read_points_file(filepath: str) -> list[str]:
+    points = []
+    with open(filepath) as points_file:
+        for line in points_file.read().splitlines():
+            if line.startswith(POINT_PREFIX):
+                points.append(line[len(POINT_PREFIX):])
+            elif points:
+                points[-1] += SPACE + line
+            else:
+                points.append(line)
+    return points
+
+def is_point_read_back(point: str, filepath: str) -> bool:
+    duplicate_filter = DuplicateFilter()
+    duplicate_filter.add_lines(read_points_file(filepath)[-1:])
+    return duplicate_filter.is_duplicate(point)
+
+def generate_duplicate_source_filepaths() -> Iterable[str]:
+    if os.path.isfile(JSTOR_FILE):
+        yield JSTOR_FILE
+    if os.path.isdir(POINT_FILES_DIRECTORY):
+        for filename in get_files_in_directory(POINT_FILES_DIRECTORY):
+            yield os.path.join(POINT_FILES_DIRECTORY, filename)
+
+def get_duplicate_sources_state() -> tuple:
+    return tuple(
+        (filepath, stat.st_mtime_ns, stat.st_size)
+        for filepath in generate_duplicate_source_filepaths()
+        for stat in (os.stat(filepath),)
+    )
+
+def load_duplicate_filter() -> DuplicateFilter:
+    duplicate_filter = DuplicateFilter()
+    for filepath in generate_duplicate_source_filepaths():
+        duplicate_filter.add_lines(read_points_file(filepath))
+    return duplicate_filter
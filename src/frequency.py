@@ -0,0 +1,80 @@
+import math
+from collections import Counter
+from itertools import repeat
+
+import numpy as np
+
+from src.processing import WORD_COUNTS
+
+class FrequencyIndex:
+
+    def __init__(self, word_counts: dict[str, int]):
+        self._n_words = len(word_counts)
+        self._total_count = sum(word_counts.values())
+        ordered_counts = sorted(word_counts.items(), key=lambda pair: (-pair[1], pair[0]))
+        self._word_ids = {word: word_id for word_id, (word, _) in enumerate(ordered_counts)}
+        counts = np.fromiter(
+            (count for _, count in ordered_counts), dtype=np.int64, count=self._n_words
+        )
+
+        smoothed_total = self._total_count + self._n_words + 1
+        positions = np.arange(1, self._n_words + 1)
+        is_new_count = np.ones(self._n_words, dtype=bool)
+        is_new_count[1:] = counts[1:] != counts[:-1]
+        ranks = np.maximum.accumulate(np.where(is_new_count, positions, 0))
+
+        self._unknown_id = self._n_words
+        self._unknown_rank = self._n_words + 1
+        self._unknown_surprisal = -math.log2(1 / smoothed_total)
+        self._ranks = np.append(ranks, self._unknown_rank)
+        self._surprisals = np.append(
+            -np.log2((counts + 1) / smoothed_total), self._unknown_surprisal
+        )
+
+        self._rarities = np.empty(self._n_words, dtype=np.int64)
+        self._rarities[np.lexsort((positions, counts))] = np.arange(self._n_words)
+        self._entries = list(zip(self._word_ids, ranks.tolist(), self._surprisals.tolist()))
+
+    def __len__(self) -> int:
+        return self._n_words
+
+    def __contains__(self, word: str) -> bool:
+        return word in self._word_ids
+
+    def get_word_ids(self, words: list[str]) -> np.ndarray:
+        return np.fromiter(
+            map(self._word_ids.get, words, repeat(self._unknown_id)), 
+            dtype=np.int64, count=len(words)
+        )
+
+    def rank(self, word: str) -> int:
+        return int(self._ranks[self._word_ids.get(word, self._unknown_id)])
+
+    def percentile(self, word: str) -> float:
+        return self.rank(word) / self._unknown_rank
+
+    def surprisal(self, word: str) -> float:
+        return float(self._surprisals[self._word_ids.get(word, self._unknown_id)])
+
+    def rare_words(self, word_counts: Counter, min_rank: int = 0) -> list[tuple[str, int, float]]:
+        words = list(word_counts)
+        word_ids = self.get_word_ids(words)
+        is_rare = self._ranks[word_ids] > min_rank
+        is_unknown = word_ids == self._unknown_id
+        rare_words = [
+            (word, self._unknown_rank, self._unknown_surprisal)
+            for word in sorted(words[i] for i in np.flatnonzero(is_rare & is_unknown).tolist())
+        ]
+        known_ids = word_ids[is_rare & ~is_unknown]
+        known_ids = known_ids[np.argsort(self._rarities[known_ids])]
+        rare_words.extend(map(self._entries.__getitem__, known_ids.tolist()))
+        return rare_words
+
+    def rare_words_by_document(self, document_word_counts: dict[str, Counter],
+                               min_rank: int = 0) -> dict[str, list[tuple[str, int, float]]]:
+        return {
+            filename: self.rare_words(word_counts, min_rank)
+            for filename, word_counts in document_word_counts.items()
+        }
+
+FREQUENCY_INDEX = FrequencyIndex(WORD_COUNTS)
@@ -0,0 +1,157 @@
+import os
+import pickle
+import threading
+from collections import Counter, defaultdict
+from typing import Generator, Optional
+
+from src.constants import CONCORDANCE_WIDTH, SPACE, REPAIR_OCR_WORDS, LEMMATIZE_WORDS
+from src.parsing import count_parsed_words
+
+def encode_varint(number: int, output: bytearray):
+    while number >= 0x80:
+        output.append((number & 0x7f) | 0x80)
+        number >>= 7
+    output.append(number)
+
+def decode_varint(data: bytes, position: int) -> tuple[int, int]:
+    number = shift = 0
+    while True:
+        byte = data[position]
+        position += 1
+        number |= (byte & 0x7f) << shift
+        if byte < 0x80:
+            return number, position
+        shift += 7
+
+def get_byte_offsets(text: str, offsets: list[int]) -> dict[int, int]:
+    if text.isascii():
+        return {offset: offset for offset in offsets}
+
+    byte_offsets = {}
+    byte_offset = character_offset = 0
+    for offset in sorted(set(offsets)):
+        byte_offset += len(text[character_offset:offset].encode())
+        character_offset = offset
+        byte_offsets[offset] = byte_offset
+    return byte_offsets
+
+def index_words(text: str, repair: bool = REPAIR_OCR_WORDS, 
+                lemmatize: bool = LEMMATIZE_WORDS) -> tuple[Counter, dict[str, list[int]]]:
+    word_positions = defaultdict(list)
+    word_counts = count_parsed_words(text, word_positions, repair, lemmatize)
+    offsets = [offset for positions in word_positions.values() for offset in positions]
+    byte_offsets = get_byte_offsets(text, offsets)
+    word_byte_positions = {
+        word: [byte_offsets[position] for position in positions]
+        for word, positions in word_positions.items()
+    }
+    return word_counts, word_byte_positions
+
+class InvertedIndex:
+
+    def __init__(self, directory: str):
+        self._directory = directory
+        self._documents: list[tuple[str, int, int]] = []
+        self._postings: dict[str, bytearray] = {}
+        self._last_document_ids: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def documents(self) -> list[str]:
+        return [filename for filename, *_ in self._documents]
+
+    def __contains__(self, word: str) -> bool:
+        return word in self._postings
+
+    def add_document(self, filename: str, word_positions: dict[str, list[int]]):
+        file_stat = os.stat(os.path.join(self._directory, filename))
+
+        with self._lock:
+            document_id = len(self._documents)
+            self._documents.append((filename, file_stat.st_size, file_stat.st_mtime_ns))
+            for word, positions in word_positions.items():
+                if (postings := self._postings.get(word)) is None:
+                    postings = self._postings[word] = bytearray()
+                    previous_document_id = 0
+                else:
+                    previous_document_id = self._last_document_ids[word]
+                self._last_document_ids[word] = document_id
+
+                encode_varint(document_id - previous_document_id, postings)
+                encode_varint(len(positions), postings)
+                previous_offset = 0
+                for byte_offset in positions:
+                    encode_varint(byte_offset - previous_offset, postings)
+                    previous_offset = byte_offset
+
+    def generate_document_postings(self, word: str) -> Generator[tuple[int, int], None, None]:
+        if (postings := self._postings.get(word)) is None:
+            return
+
+        position = document_id = 0
+        while position < len(postings):
+            document_delta, position = decode_varint(postings, position)
+            n_offsets, position = decode_varint(postings, position)
+            document_id += document_delta
+            offset = 0
+            for _ in range(n_offsets):
+                offset_delta, position = decode_varint(postings, position)
+                offset += offset_delta
+                yield document_id, offset
+
+    def generate_postings(self, word: str) -> Generator[tuple[str, int], None, None]:
+        for document_id, offset in self.generate_document_postings(word):
+            yield self._documents[document_id][0], offset
+
+    def get_document_frequency(self, word: str) -> int:
+        return len({filename for filename, _ in self.generate_postings(word)})
+
+    def is_stale(self, document_id: int) -> bool:
+        filename, size, mtime_ns = self._documents[document_id]
+        filepath = os.path.join(self._directory, filename)
+        if not os.path.exists(filepath):
+            return True
+        file_stat = os.stat(filepath)
+        return file_stat.st_size != size or file_stat.st_mtime_ns != mtime_ns
+
+    def concordance(self, word: str, n: int = 10,
+                    width: int = CONCORDANCE_WIDTH) -> list[tuple[str, str]]:
+        stale_document_ids = set(filter(self.is_stale, range(len(self._documents))))
+        open_files = {}
+        contexts = []
+        try:
+            for document_id, offset in self.generate_document_postings(word.lower()):
+                if len(contexts) >= n:
+                    break
+                if document_id in stale_document_ids:
+                    continue
+                filename = self._documents[document_id][0]
+                if (txt_file := open_files.get(filename)) is None:
+                    filepath = os.path.join(self._directory, filename)
+                    txt_file = open_files[filename] = open(filepath, "rb")
+
+                start = max(offset - width, 0)
+                txt_file.seek(start)
+                window = txt_file.read(offset - start + len(word) + width)
+                context = window.decode(errors="ignore").split()
+                contexts.append((filename, SPACE.join(context)))
+        finally:
+            for txt_file in open_files.values():
+                txt_file.close()
+        return contexts
+
+    def save(self, filepath: str):
+        index_data = (self._documents, self._postings, self._last_document_ids)
+        with open(filepath, "wb") as index_file:
+            pickle.dump(index_data, index_file, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, directory: str, filepath: str) -> Optional["InvertedIndex"]:
+        if not os.path.isfile(filepath):
+            return None
+        word_index = cls(directory)
+        with open(filepath, "rb") as index_file:
+            (word_index._documents,
+             word_index._postings,
+             word_index._last_document_ids) = pickle.load(index_file)
+        return word_index
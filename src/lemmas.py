@@ -0,0 +1,154 @@
+import os
+import threading
+from collections import Counter
+from functools import partial
+from typing import Callable, Iterable, Optional
+
+import nltk
+from nltk.corpus import wordnet
+
+from src.constants import (
+    COMMA,
+    FOLDER_DIR,
+    WORDS_CORPUS,
+    LEMMAS_FILENAME,
+    LEMMA_SUFFIX_RULES,
+    MIN_LEMMA_LENGTH,
+    INFLECTED_STEM_SUFFIXES,
+    PLURAL_EXCLUDED_STEM_ENDINGS,
+    SIBILANT_STEM_ENDINGS,
+    UNDOUBLED_CONSONANTS,
+    LEMMA_EXCEPTIONS,
+    WORDNET_POS_ORDER,
+    LEMMA_TABLE_VERSION,
+    WORDNET_RESOURCE,
+    WORDNET_LEMMA_BUILDER,
+    RULES_LEMMA_BUILDER,
+)
+from src.processing import WORD_COUNTS
+
+VOWELS = frozenset("aeiou")
+SYLLABLE_VOWELS = VOWELS | {"y"}
+FINAL_E_STEM_ENDINGS = SYLLABLE_VOWELS - {"u"}
+
+def count_syllables(stem: str) -> int:
+    return sum(
+        character in SYLLABLE_VOWELS and (i == 0 or stem[i - 1] not in SYLLABLE_VOWELS)
+        for i, character in enumerate(stem)
+    )
+
+def drops_final_e(stem: str) -> bool:
+    return count_syllables(stem[:-1]) > 0 and stem[-1] not in FINAL_E_STEM_ENDINGS
+
+def doubles_final_consonant(stem: str) -> bool:
+    return (
+        count_syllables(stem) == 1 and len(stem) >= 2
+        and stem[-1] not in SYLLABLE_VOWELS and stem[-1] not in UNDOUBLED_CONSONANTS
+        and stem[-2] in VOWELS and (len(stem) == 2 or stem[-3] not in VOWELS)
+    )
+
+def is_inflected_stem(stem: str, suffix: str, replacement: str) -> bool:
+    if count_syllables(stem + replacement) == 0:
+        return False
+    if suffix == "s":
+        return not stem.endswith(PLURAL_EXCLUDED_STEM_ENDINGS)
+    if suffix == "es":
+        return stem.endswith(SIBILANT_STEM_ENDINGS)
+    if suffix not in INFLECTED_STEM_SUFFIXES:
+        return True
+    if replacement == "e":
+        return drops_final_e(stem)
+    return not doubles_final_consonant(stem) and not (suffix == "ed" and stem.endswith("e"))
+
+def generate_lemma_candidates(word: str) -> Iterable[str]:
+    for suffix, replacement in LEMMA_SUFFIX_RULES:
+        if not word.endswith(suffix):
+            continue
+        stem = word[:-len(suffix)]
+        if is_inflected_stem(stem, suffix, replacement):
+            yield stem + replacement
+        if (suffix in INFLECTED_STEM_SUFFIXES and not replacement and len(stem) > 2 
+                and stem[-1] == stem[-2] and doubles_final_consonant(stem[:-1])):
+            yield stem[:-1]
+
+def find_lemma(word: str, lexicon: frozenset[str]) -> Optional[str]:
+    candidates = [
+        candidate for candidate in generate_lemma_candidates(word)
+        if len(candidate) >= MIN_LEMMA_LENGTH and candidate in lexicon
+    ]
+    return max(candidates, key=lambda candidate: WORD_COUNTS.get(candidate, 0), default=None)
+
+def find_wordnet_lemma(word: str) -> Optional[str]:
+    lemmas = [wordnet.morphy(word, pos) for pos in WORDNET_POS_ORDER]
+    if word in lemmas:
+        return None
+    return next(filter(None, lemmas), None)
+
+def get_lemma_builder() -> str:
+    try:
+        nltk.data.find(WORDNET_RESOURCE)
+    except LookupError:
+        return RULES_LEMMA_BUILDER
+    return WORDNET_LEMMA_BUILDER
+
+def get_lemma_table_header(builder: str) -> str:
+    return f"word,lemma,{LEMMA_TABLE_VERSION},{builder}"
+
+def get_lemma_finder(lexicon: frozenset[str], builder: str) -> Callable[[str], Optional[str]]:
+    if builder == WORDNET_LEMMA_BUILDER:
+        return find_wordnet_lemma
+    print("WordNet corpus not found, building lemma table from suffix rules.")
+    return partial(find_lemma, lexicon=lexicon)
+
+def build_lemma_table(lexicon: frozenset[str], builder: Optional[str] = None) -> dict[str, str]:
+    find_word_lemma = get_lemma_finder(lexicon, builder or get_lemma_builder())
+    lemma_table = {}
+    for word in lexicon:
+        lemma = LEMMA_EXCEPTIONS[word] if word in LEMMA_EXCEPTIONS else find_word_lemma(word)
+        if lemma is not None and lemma != word:
+            lemma_table[word] = lemma
+    return lemma_table
+
+def write_lemma_table(lemma_table: dict[str, str], builder: str, 
+                      relpath: str = LEMMAS_FILENAME):
+    filepath = os.path.join(FOLDER_DIR, relpath)
+    with open(filepath, "w") as lemmas_file:
+        lemmas_file.write(get_lemma_table_header(builder) + "\n")
+        for word, lemma in sorted(lemma_table.items()):
+            lemmas_file.write(f"{word},{lemma}\n")
+
+def get_lemma_table_from_file(builder: str, 
+                              relpath: str = LEMMAS_FILENAME) -> Optional[dict[str, str]]:
+    filepath = os.path.join(FOLDER_DIR, relpath)
+    if not os.path.isfile(filepath):
+        return None
+    lemma_table = {}
+    with open(filepath) as lemmas_file:
+        lines = lemmas_file.readlines()
+        if not lines or lines[0].rstrip() != get_lemma_table_header(builder):
+            return None
+        for line in lines[1:]:
+            word, lemma = line.rstrip().split(COMMA)
+            lemma_table[word] = lemma
+    return lemma_table
+
+_lemma_table: Optional[dict[str, str]] = None
+_lemma_table_lock = threading.Lock()
+
+def get_lemma_table() -> dict[str, str]:
+    global _lemma_table
+    with _lemma_table_lock:
+        if _lemma_table is not None:
+            return _lemma_table
+        builder = get_lemma_builder()
+        if (_lemma_table := get_lemma_table_from_file(builder)) is None:
+            _lemma_table = build_lemma_table(WORDS_CORPUS.union(WORD_COUNTS), builder)
+            write_lemma_table(_lemma_table, builder)
+    return _lemma_table
+
+def lemmatize_word_counts(word_counts: Counter) -> Counter:
+    lemma_table = get_lemma_table()
+    lemma_counts = Counter()
+    for word, count in word_counts.items():
+        lemma_counts[lemma_table.get(word, word)] += count
+    return lemma_counts
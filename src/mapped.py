@@ -0,0 +1,66 @@
+import os
+import mmap
+from collections import Counter, defaultdict
+from typing import Optional
+
+from src.constants import LEMMATIZE_WORDS, REPAIR_OCR_WORDS
+from src.patterns import BYTES_WORD_TOKEN_PATTERN, NON_ASCII_BYTES_PATTERN
+from src.processing import is_english
+from src.index import index_words
+from src.lemmas import get_lemma_table
+
+def get_lexicon_word(token: bytes, lemma_table: dict[str, str]) -> Optional[str]:
+    word = token.lower().decode("ascii")
+    return lemma_table.get(word, word) if is_english(word) else None
+
+def count_mapped_words(filepath: str, lemmatize: bool = LEMMATIZE_WORDS) -> Optional[Counter]:
+    with open(filepath, "rb") as binary_file:
+        if os.fstat(binary_file.fileno()).st_size == 0:
+            return Counter()
+        with mmap.mmap(binary_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped_file:
+            buffer = memoryview(mapped_file)
+            try:
+                if NON_ASCII_BYTES_PATTERN.search(buffer):
+                    return None
+                token_counts = Counter(BYTES_WORD_TOKEN_PATTERN.findall(buffer))
+            finally:
+                buffer.release()
+
+    lemma_table = get_lemma_table() if lemmatize else {}
+    word_counts = Counter()
+    for token, count in token_counts.items():
+        if (word := get_lexicon_word(token, lemma_table)) is not None:
+            word_counts[word] += count
+    return word_counts
+
+def index_mapped_words(filepath: str, 
+                       lemmatize: bool = LEMMATIZE_WORDS) -> Optional[tuple[Counter, dict[str, list[int]]]]:
+    lemma_table = get_lemma_table() if lemmatize else {}
+    word_counts = Counter()
+    word_positions = defaultdict(list)
+    lexicon_words: dict[bytes, Optional[str]] = {}
+    with open(filepath, "rb") as binary_file:
+        if os.fstat(binary_file.fileno()).st_size == 0:
+            return word_counts, {}
+        with mmap.mmap(binary_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped_file:
+            buffer = memoryview(mapped_file)
+            try:
+                if NON_ASCII_BYTES_PATTERN.search(buffer):
+                    return None
+                for match in BYTES_WORD_TOKEN_PATTERN.finditer(buffer):
+                    token = match.group(1)
+                    if (word := lexicon_words.get(token, token)) is token:
+                        word = lexicon_words[token] = get_lexicon_word(token, lemma_table)
+                    if word is not None:
+                        word_counts[word] += 1
+                        word_positions[word].append(match.start(1))
+            finally:
+                buffer.release()
+    return word_counts, dict(word_positions)
+
+def index_txt_file(filepath: str, repair: bool = REPAIR_OCR_WORDS, 
+                   lemmatize: bool = LEMMATIZE_WORDS) -> tuple[Counter, dict[str, list[int]]]:
+    if not repair and (indexed_words := index_mapped_words(filepath, lemmatize)) is not None:
+        return indexed_words
+    with open(filepath, newline="") as txt_file:
+        return index_words(txt_file.read(), repair, lemmatize)
@@ -0,0 +1,198 @@
+import heapq
+import math
+import random
+from array import array
+from typing import Generator, Optional
+
+from src.constants import (
+    DOUBLEWORD_SEPARATOR,
+    SENTENCE_BREAK_CHARACTERS,
+    BIGRAM_MIN_COUNT,
+    BIGRAM_MAX_PAIRS,
+    SKETCH_WIDTH,
+    SKETCH_DEPTH,
+    COLLOCATION_TOP_K,
+    PMI_MEASURE,
+    LLR_MEASURE,
+)
+from src.parsing import parse_without_punctuation
+from src.processing import is_english_word
+
+MERSENNE_PRIME = (1 << 61) - 1
+WORD_ID_BITS = 32
+
+def generate_sentence_words(text: str) -> Generator[Optional[str], None, None]:
+    for token in text.split():
+        word = parse_without_punctuation(token)
+        if is_english_word(word):
+            yield word.lower()
+        else:
+            yield None
+            continue
+        if token[-1] in SENTENCE_BREAK_CHARACTERS:
+            yield None
+
+def pack_pair(word_id: int, other_word_id: int) -> int:
+    return (word_id << WORD_ID_BITS) | other_word_id
+
+def unpack_pair(key: int) -> tuple[int, int]:
+    return key >> WORD_ID_BITS, key & ((1 << WORD_ID_BITS) - 1)
+
+def get_pmi(pair_count: int, first_count: int, second_count: int, n_pairs: int) -> float:
+    return math.log2(pair_count * n_pairs / (first_count * second_count))
+
+def get_log_likelihood(pair_count: int, first_count: int, second_count: int, n_pairs: int) -> float:
+    observed = (
+        (pair_count, first_count, second_count),
+        (first_count - pair_count, first_count, n_pairs - second_count),
+        (second_count - pair_count, n_pairs - first_count, second_count),
+        (n_pairs - first_count - second_count + pair_count,
+         n_pairs - first_count, n_pairs - second_count),
+    )
+    return 2 * sum(
+        count * math.log(count * n_pairs / (row_total * column_total))
+        for count, row_total, column_total in observed
+        if count > 0
+    )
+
+COLLOCATION_MEASURES = {
+    PMI_MEASURE: get_pmi,
+    LLR_MEASURE: get_log_likelihood,
+}
+
+class CountMinSketch:
+
+    def __init__(self, width: int = SKETCH_WIDTH, depth: int = SKETCH_DEPTH, seed: int = 1):
+        generator = random.Random(seed)
+        self._width = width
+        self._hashes = [
+            (generator.randrange(1, MERSENNE_PRIME), generator.randrange(MERSENNE_PRIME))
+            for _ in range(depth)
+        ]
+        self._rows = [array("I", bytes(4 * width)) for _ in range(depth)]
+
+    def add(self, key: int) -> int:
+        estimate = None
+        for row, (a, b) in zip(self._rows, self._hashes):
+            column = ((a * key + b) % MERSENNE_PRIME) % self._width
+            row[column] += 1
+            if estimate is None or row[column] < estimate:
+                estimate = row[column]
+        return estimate
+
+    def estimate(self, key: int) -> int:
+        return min(
+            row[((a * key + b) % MERSENNE_PRIME) % self._width]
+            for row, (a, b) in zip(self._rows, self._hashes)
+        )
+
+class BigramCounter:
+
+    def __init__(self, min_count: int = BIGRAM_MIN_COUNT, max_pairs: int = BIGRAM_MAX_PAIRS,
+                 use_sketch: bool = False, top_k: int = COLLOCATION_TOP_K):
+        self._min_count = min_count
+        self._max_pairs = max_pairs
+        self._word_ids: dict[str, int] = {}
+        self._words: list[str] = []
+        self._first_counts = array("Q")
+        self._second_counts = array("Q")
+        self._n_pairs = 0
+        self._prune_level = 0
+
+        self._pair_counts: dict[int, int] = {}
+        self._sketch = CountMinSketch() if use_sketch else None
+        self._top_k = top_k
+        self._candidate_heap: list[tuple[int, int]] = []
+
+    @property
+    def n_pairs(self) -> int:
+        return self._n_pairs
+
+    def get_word_id(self, word: str) -> int:
+        if (word_id := self._word_ids.get(word)) is None:
+            word_id = self._word_ids[word] = len(self._words)
+            self._words.append(word)
+            self._first_counts.append(0)
+            self._second_counts.append(0)
+        return word_id
+
+    def add_text(self, text: str):
+        previous_word_id = None
+        for word in generate_sentence_words(text):
+            if word is None:
+                previous_word_id = None
+                continue
+            word_id = self.get_word_id(word)
+            if previous_word_id is not None:
+                self.add_pair(previous_word_id, word_id)
+            previous_word_id = word_id
+
+    def add_pair(self, word_id: int, other_word_id: int):
+        self._n_pairs += 1
+        self._first_counts[word_id] += 1
+        self._second_counts[other_word_id] += 1
+        key = pack_pair(word_id, other_word_id)
+
+        if self._sketch is not None:
+            self.add_candidate(key, self._sketch.add(key))
+            return
+
+        self._pair_counts[key] = self._pair_counts.get(key, 0) + 1
+        if len(self._pair_counts) > self._max_pairs:
+            self.prune()
+
+    def add_candidate(self, key: int, estimate: int):
+        if key in self._pair_counts:
+            self._pair_counts[key] = estimate
+            return
+        if len(self._pair_counts) < self._top_k:
+            self._pair_counts[key] = estimate
+            heapq.heappush(self._candidate_heap, (estimate, key))
+            return
+
+        while self._candidate_heap:
+            smallest_estimate, smallest_key = self._candidate_heap[0]
+            current_estimate = self._pair_counts[smallest_key]
+            if current_estimate == smallest_estimate:
+                break
+            heapq.heapreplace(self._candidate_heap, (current_estimate, smallest_key))
+
+        if estimate > self._candidate_heap[0][0]:
+            _, evicted_key = heapq.heapreplace(self._candidate_heap, (estimate, key))
+            del self._pair_counts[evicted_key]
+            self._pair_counts[key] = estimate
+
+    def prune(self):
+        while len(self._pair_counts) > self._max_pairs // 2:
+            self._prune_level += 1
+            self._pair_counts = {
+                key: count for key, count in self._pair_counts.items()
+                if count > self._prune_level
+            }
+
+    def get_pair_count(self, word: str, other_word: str) -> int:
+        if (word_id := self._word_ids.get(word)) is None:
+            return 0
+        if (other_word_id := self._word_ids.get(other_word)) is None:
+            return 0
+        key = pack_pair(word_id, other_word_id)
+        if self._sketch is not None:
+            return self._sketch.estimate(key)
+        return self._pair_counts.get(key, 0)
+
+    def get_collocations(self, n: int = 20, measure: str = LLR_MEASURE,
+                         min_count: Optional[int] = None) -> list[tuple[str, int, float]]:
+        score_function = COLLOCATION_MEASURES[measure]
+        min_count = self._min_count if min_count is None else min_count
+        collocations = []
+        for key, pair_count in self._pair_counts.items():
+            if pair_count < min_count:
+                continue
+            word_id, other_word_id = unpack_pair(key)
+            first_count = self._first_counts[word_id]
+            second_count = self._second_counts[other_word_id]
+            pair_count = min(pair_count, first_count, second_count)
+            score = score_function(pair_count, first_count, second_count, self._n_pairs)
+            bigram = self._words[word_id] + DOUBLEWORD_SEPARATOR + self._words[other_word_id]
+            collocations.append((bigram, pair_count, score))
+        return heapq.nlargest(n, collocations, key=lambda triple: (triple[2], triple[1]))
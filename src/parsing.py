@@ -1,4 +1,4 @@
-from collections import Counter
+from collections import Counter, defaultdict
 from typing import Any, Callable, Optional
 
 from src.constants import (
@@ -13,10 +13,13 @@ from src.constants import (
     COMBINE_SPLITWORDS,
     SEPARATE_DOUBLEWORDS,
     SPLIT_BY_FREQUENCY,
+    REPAIR_OCR_WORDS,
+    LEMMATIZE_WORDS,
 )
 from src.patterns import (
     WHITESPACE_PATTERN,
     WORD_SEARCH_PATTERN,
+    TOKEN_PATTERN,
     CAPWORDS_PATTERN,
     CITATION_NUMBER_PATTERN,
     DOUBLE_SPACE_PATTERN,
@@ -32,7 +35,10 @@ from src.patterns import (
     AUTHOR_CITATION_PATTERN,
     JSTOR_TERMS_PATTERN
 )
-from src.processing import is_proper_noun, is_english_word, get_word_frequency
+from src.processing import is_word, is_proper_noun, is_english_word, get_word_frequency
+from src.duplicates import DuplicateFilter
+from src.correction import repair_word
+from src.lemmas import get_lemma_table
 
 def substitution_pattern(arg_pos: int, function: Callable, 
                          *args: tuple, predicate: Optional[bool] = None) -> Callable:
@@ -70,17 +76,42 @@ def is_valid_word_ratio(line: str) -> bool:
 def is_valid_line(line: str) -> bool:
     return is_valid_word_ratio(line)
 
-def count_words(text: str) -> Counter:
+def count_words(text: str, repair: bool = REPAIR_OCR_WORDS, 
+                lemmatize: bool = LEMMATIZE_WORDS) -> Counter:
+    return count_parsed_words(parse_text(text), repair=repair, lemmatize=lemmatize)
+
+def count_parsed_words(text: str, 
+                       word_positions: Optional[defaultdict[str, list[int]]] = None,
+                       repair: bool = REPAIR_OCR_WORDS,
+                       lemmatize: bool = LEMMATIZE_WORDS) -> Counter:
     word_counts = Counter()
-    tokens = parse_text(text).split()
-    for token in tokens:
-        token = parse_without_punctuation(token).lower()
-        if CAPWORDS_PATTERN.search(token):
-            split_words = CAPWORDS_PATTERN.sub(SPACE, token).lower().split()
-            for word in filter(is_english_word, split_words):
-                word_counts[word] += 1
-        elif is_english_word(token):
-            word_counts[token.lower()] += 1
+    lemma_table = get_lemma_table() if lemmatize else {}
+    if word_positions is None:
+        tokens = ((token, 0) for token in text.split())
+    else:
+        tokens = ((match.group(0), match.start()) for match in TOKEN_PATTERN.finditer(text))
+
+    for token, position in tokens:
+        original_word = parse_without_punctuation(token)
+        if word_positions is not None:
+            position += token.index(original_word)
+        word = original_word.lower()
+        if CAPWORDS_PATTERN.search(word):
+            split_words = CAPWORDS_PATTERN.sub(SPACE, word).lower().split()
+            counted_words = list(filter(is_english_word, split_words))
+        elif is_english_word(word):
+            counted_words = [word.lower()]
+        elif (repair and is_word(word) and not is_proper_noun(original_word) and 
+              (repaired_word := repair_word(word)) is not None):
+            counted_words = [repaired_word]
+        else:
+            continue
+
+        for counted_word in counted_words:
+            counted_word = lemma_table.get(counted_word, counted_word)
+            word_counts[counted_word] += 1
+            if word_positions is not None:
+                word_positions[counted_word].append(position)
     return word_counts
 
 def parse_word(token: str) -> str:
@@ -185,7 +216,14 @@ def parse_text(text: str) -> str:
         text = substitution(text)
     return text
 
-def parse_fulltext(text: str) -> list[str]:
+def parse_fulltext(text: str, duplicate_filter: Optional[DuplicateFilter] = None,
+                   repair: bool = REPAIR_OCR_WORDS) -> list[str]:
+    parsed_lines = parse_fulltext_lines(text, repair)
+    if duplicate_filter is None:
+        return parsed_lines
+    return duplicate_filter.filter(parsed_lines)
+
+def parse_fulltext_lines(text: str, repair: bool = REPAIR_OCR_WORDS) -> list[str]:
     parsed_lines = []
     lines = LINE_SPLIT_PATTERN.split(parse_text(text))
     for line in lines:
@@ -214,6 +252,11 @@ def parse_fulltext(text: str) -> list[str]:
                 parsed_word = token.replace(word, combined_word, 1)
                 parsed_word = '|' + combined_word + '|'
                 remove_previous_token = True
+            elif (repair and is_splittable and 
+                (repaired_word := repair_word(word)) is not None
+            ):
+                parsed_word = token.replace(word, repaired_word, 1)
+                parsed_word = '~' + parsed_word + '~'
             elif (SEPARATE_DOUBLEWORDS and is_splittable and 
                 (split_doubleword := parse_doubleword(token)) is not None
             ):
@@ -1,8 +1,20 @@
 import re
 
+from src.constants import REMOVABLE_CHARACTERS, ASCII_WHITESPACE
+
 WORD_SEARCH_PATTERN = re.compile(r"[a-zA-Z]+")
 CAPWORDS_PATTERN = re.compile(r"(?<=[A-Za-z][a-z])(?=[A-Z][a-z])")
 WORD_PATTERN = re.compile(r"^[a-zA-Z]+$")
+TOKEN_PATTERN = re.compile(r"\S+")
+
+BYTES_WHITESPACE = re.escape(ASCII_WHITESPACE.encode())
+BYTES_REMOVABLE = re.escape(REMOVABLE_CHARACTERS.encode())
+BYTES_WORD_TOKEN_PATTERN = re.compile(
+    rb"(?<![^" + BYTES_WHITESPACE + rb"])[" + BYTES_REMOVABLE + rb"]*"
+    rb"([a-zA-Z]{2,})"
+    rb"[" + BYTES_REMOVABLE + rb"]*(?![^" + BYTES_WHITESPACE + rb"])"
+)
+NON_ASCII_BYTES_PATTERN = re.compile(rb"[\x80-\xff]")
 
 WHITESPACE_PATTERN = re.compile(r"^\s+$")
 WHITESPACE_HYPHEN_PATTERN = re.compile(r"- ?\n ?")
@@ -0,0 +1,183 @@
+import queue
+import multiprocessing
+import threading
+import time
+import concurrent.futures
+from contextlib import nullcontext
+from typing import Any, Callable, Iterable, Optional
+
+from src.constants import (
+    PROCESS_EXECUTOR,
+    PROCESS_START_METHOD,
+    THREAD_EXECUTOR,
+    PIPELINE_QUEUE_SIZE,
+    PIPELINE_STAGE_CONFIG,
+)
+from src.profiling import MemoryProfiler
+
+class Stage:
+
+    SENTINEL = object()
+
+    def __init__(self, name: str, function: Callable, n_workers: int = 1,
+                 executor: str = THREAD_EXECUTOR, keyed: bool = True, fan_out: bool = False):
+        assert executor in (THREAD_EXECUTOR, PROCESS_EXECUTOR), f"Unknown executor {executor!r}"
+        self.name = name
+        self.function = function
+        self.n_workers = max(n_workers, 1)
+        self.executor = executor
+        self.keyed = keyed
+        self.fan_out = fan_out
+
+        self.n_items = 0
+        self.busy_time = 0.0
+        self.peak_queue_depth = 0
+
+    @classmethod
+    def configured(cls, name: str, function: Callable, **kwargs: Any) -> "Stage":
+        n_workers, executor = PIPELINE_STAGE_CONFIG.get(name, (1, THREAD_EXECUTOR))
+        return cls(name, function, n_workers, executor, **kwargs)
+
+class Pipeline:
+
+    def __init__(self, stages: list[Stage], max_queue_size: int = PIPELINE_QUEUE_SIZE):
+        self._stages = stages
+        self._queues = [queue.Queue(maxsize=max_queue_size) for _ in stages]
+        self._max_queue_size = max_queue_size
+        self._active_workers = [stage.n_workers for stage in stages]
+        self._lock = threading.Lock()
+        self._finished = threading.Event()
+        self._errors: list[tuple[str, Any, Exception]] = []
+
+    @property
+    def errors(self) -> list[tuple[str, Any, Exception]]:
+        return self._errors
+
+    def get_queue_depths(self) -> dict[str, int]:
+        return {
+            stage.name: stage_queue.qsize()
+            for stage, stage_queue in zip(self._stages, self._queues)
+        }
+
+    def format_queue_depths(self) -> str:
+        return " | ".join(
+            f"{name} {depth}/{self._max_queue_size}"
+            for name, depth in self.get_queue_depths().items()
+        )
+
+    def get_stage_report(self) -> list[str]:
+        return [
+            f"{stage.name}: {stage.n_items} items, {stage.busy_time:.2f}s busy, "
+            f"peak queue {stage.peak_queue_depth}/{self._max_queue_size}, "
+            f"{stage.n_workers} {stage.executor} workers"
+            for stage in self._stages
+        ]
+
+    def run(self, items: Iterable, report_interval: Optional[float] = None):
+        process_context = multiprocessing.get_context(PROCESS_START_METHOD)
+        pools = {
+            stage.name: concurrent.futures.ProcessPoolExecutor(
+                stage.n_workers, mp_context=process_context
+            )
+            for stage in self._stages if stage.executor == PROCESS_EXECUTOR
+        }
+        workers = [
+            threading.Thread(target=self._work, args=(index, pools.get(stage.name)), daemon=True)
+            for index, stage in enumerate(self._stages)
+            for _ in range(stage.n_workers)
+        ]
+        monitor = threading.Thread(target=self._monitor, args=(report_interval,), daemon=True)
+        for thread in workers:
+            thread.start()
+        monitor.start()
+
+        try:
+            for item in items:
+                self._queues[0].put(item)
+            for _ in range(self._stages[0].n_workers):
+                self._queues[0].put(Stage.SENTINEL)
+            for thread in workers:
+                thread.join()
+        finally:
+            self._finished.set()
+            monitor.join()
+            for pool in pools.values():
+                pool.shutdown()
+
+    def run_sequentially(self, items: Iterable, profiler: Optional[MemoryProfiler] = None):
+        for item in items:
+            self._run_item(0, item, str(item), profiler)
+
+    def _run_item(self, index: int, item: Any, document: str, 
+                  profiler: Optional[MemoryProfiler]):
+        if index == len(self._stages):
+            return
+
+        stage = self._stages[index]
+        key, value = item if stage.keyed else (item, item)
+        context = nullcontext() if profiler is None else profiler.profile(document, stage.name)
+        try:
+            with context:
+                result = stage.function(value)
+                results = list(result) if stage.fan_out else (result,)
+        except Exception as error:
+            print(f"Stage {stage.name!r} failed on {key!r}: {error}")
+            self._errors.append((stage.name, key, error))
+            return
+
+        for result in results:
+            if result is None:
+                continue
+            if stage.fan_out:
+                next_document = str(result[0] if isinstance(result, tuple) else result)
+            else:
+                next_document = document
+            next_item = (key, result) if stage.keyed else result
+            self._run_item(index + 1, next_item, next_document, profiler)
+
+    def _monitor(self, report_interval: Optional[float]):
+        interval = report_interval or 0.1
+        while not self._finished.wait(interval):
+            for stage, depth in zip(self._stages, self.get_queue_depths().values()):
+                stage.peak_queue_depth = max(stage.peak_queue_depth, depth)
+            if report_interval is not None:
+                print(self.format_queue_depths())
+
+    def _apply(self, stage: Stage, pool: Optional[concurrent.futures.Executor], value: Any) -> Any:
+        if pool is None:
+            return stage.function(value)
+        return pool.submit(stage.function, value).result()
+
+    def _emit(self, index: int, item: Any):
+        if index + 1 < len(self._queues):
+            self._queues[index + 1].put(item)
+
+    def _work(self, index: int, pool: Optional[concurrent.futures.Executor]):
+        stage = self._stages[index]
+        input_queue = self._queues[index]
+        while (item := input_queue.get()) is not Stage.SENTINEL:
+            key, value = item if stage.keyed else (item, item)
+            start_time = time.perf_counter()
+            try:
+                result = self._apply(stage, pool, value)
+                busy_time = time.perf_counter() - start_time
+                results = result if stage.fan_out else (result,)
+                for result in results:
+                    if result is not None:
+                        self._emit(index, (key, result) if stage.keyed else result)
+            except Exception as error:
+                busy_time = time.perf_counter() - start_time
+                print(f"Stage {stage.name!r} failed on {key!r}: {error}")
+                with self._lock:
+                    self._errors.append((stage.name, key, error))
+
+            with self._lock:
+                stage.n_items += 1
+                stage.busy_time += busy_time
+
+        with self._lock:
+            self._active_workers[index] -= 1
+            is_last_worker = self._active_workers[index] == 0
+        if is_last_worker and index + 1 < len(self._stages):
+            for _ in range(self._stages[index + 1].n_workers):
+                self._queues[index + 1].put(Stage.SENTINEL)
@@ -13,6 +13,7 @@ from src.constants import (
 )
 from src.processing import clear_screen
 from src.parsing import parse_line
+from src.duplicates import format_point_line, is_point_read_back
 
 class PointList:
 
@@ -108,7 +109,8 @@ class PointList:
         elif command_name == "bad":
             point = self.get_point_at_index(self.__index)
             with open(JSTOR_FILE, "a") as jstor_file:
-                jstor_file.write(POINT_PREFIX + point + '\n')
+                jstor_file.write(format_point_line(point))
+            assert is_point_read_back(point, JSTOR_FILE), "Bad point must be filtered when read back"
             
             self.forward()
             return
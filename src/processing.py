@@ -14,6 +14,10 @@ from src.constants import (
     DEFAULT_WORD_COUNTS_FILENAME,
     SAVED_FILES_DIRECTORY,
     FILE_EXTENSION,
+    INDEX_FILES_DIRECTORY,
+    INDEX_FILE_EXTENSION,
+    COUNTS_FILE_EXTENSION,
+    EXTRACTOR_FILE_EXTENSION,
 )
 from src.patterns import WORD_PATTERN
 
@@ -92,6 +96,19 @@ def get_points_output_filepath(filename: str) -> str:
 
     return filepath
 
+def make_index_files_directory():
+    if not os.path.exists(INDEX_FILES_DIRECTORY):
+        os.mkdir(INDEX_FILES_DIRECTORY)
+
+def get_index_filepath(folder_name: str) -> str:
+    return os.path.join(INDEX_FILES_DIRECTORY, folder_name + INDEX_FILE_EXTENSION)
+
+def get_document_counts_filepath(folder_name: str) -> str:
+    return os.path.join(INDEX_FILES_DIRECTORY, folder_name + COUNTS_FILE_EXTENSION)
+
+def get_extractor_filepath(folder_name: str) -> str:
+    return os.path.join(INDEX_FILES_DIRECTORY, folder_name + EXTRACTOR_FILE_EXTENSION)
+
 def get_word_counts_from_file(relpath: str) -> dict[str, int]:
     filepath = os.path.join(FOLDER_DIR, relpath)
     word_counts = {}
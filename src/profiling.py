@@ -0,0 +1,96 @@
+import tracemalloc
+from contextlib import contextmanager
+from typing import Generator, Optional
+
+from src.constants import MEMORY_TOP_ALLOCATIONS, MEMORY_TRACEBACK_LIMIT
+
+def format_size(n_bytes: int) -> str:
+    size = float(n_bytes)
+    for unit in ("B", "KiB", "MiB"):
+        if abs(size) < 1024:
+            return f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GiB"
+
+class StageMemory:
+
+    def __init__(self, document: str, stage_name: str, peak: int, retained: int,
+                 allocation_sites: list[tuple[str, int]]):
+        self.document = document
+        self.stage_name = stage_name
+        self.peak = peak
+        self.retained = retained
+        self.allocation_sites = allocation_sites
+
+class MemoryProfiler:
+
+    def __init__(self, n_top_allocations: int = MEMORY_TOP_ALLOCATIONS):
+        self._n_top_allocations = n_top_allocations
+        self._records: list[StageMemory] = []
+        self._started_tracing = False
+
+    @property
+    def records(self) -> list[StageMemory]:
+        return self._records
+
+    def __enter__(self) -> "MemoryProfiler":
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(MEMORY_TRACEBACK_LIMIT)
+            self._started_tracing = True
+        return self
+
+    def __exit__(self, *_):
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def get_allocation_sites(self, snapshot: tracemalloc.Snapshot,
+                             start_snapshot: tracemalloc.Snapshot) -> list[tuple[str, int]]:
+        statistics = snapshot.compare_to(start_snapshot, "lineno")
+        return [
+            (str(statistic.traceback), statistic.size_diff)
+            for statistic in statistics[:self._n_top_allocations]
+            if statistic.size_diff > 0
+        ]
+
+    @contextmanager
+    def profile(self, document: str, stage_name: str) -> Generator[None, None, None]:
+        trace_filters = (
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+        )
+        start_snapshot = tracemalloc.take_snapshot().filter_traces(trace_filters)
+        start_memory, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        try:
+            yield
+        finally:
+            current_memory, peak_memory = tracemalloc.get_traced_memory()
+            snapshot = tracemalloc.take_snapshot().filter_traces(trace_filters)
+            self._records.append(StageMemory(
+                document,
+                stage_name,
+                peak_memory - start_memory,
+                current_memory - start_memory,
+                self.get_allocation_sites(snapshot, start_snapshot),
+            ))
+
+    def get_peak_record(self) -> Optional[StageMemory]:
+        return max(self._records, key=lambda record: record.peak, default=None)
+
+    def get_report(self) -> list[str]:
+        if (peak_record := self.get_peak_record()) is None:
+            return ["No stages were profiled."]
+
+        report = [
+            f"Peak of {format_size(peak_record.peak)} in stage "
+            f"{peak_record.stage_name!r} of {peak_record.document!r}"
+        ]
+        for record in sorted(self._records, key=lambda record: -record.peak):
+            report.append(
+                f"{record.document} [{record.stage_name}] peak {format_size(record.peak)}, "
+                f"retained {format_size(record.retained)}"
+            )
+            for site, size in record.allocation_sites:
+                report.append(f"    {site}: {format_size(size)}")
+        return report
@@ -0,0 +1,62 @@
+import os
+import socketserver
+from typing import Any, Callable
+
+from src.client import DEFAULT_SOCKET_PATH, encode_message, decode_message
+from src.parsing import count_words, parse_doubleword, parse_fulltext, parse_text
+
+SERVER_COMMANDS: dict[str, Callable[[str], Any]] = {
+    "ping": lambda _: "pong",
+    "parse_text": parse_text,
+    "count_words": lambda text: dict(count_words(text)),
+    "parse_fulltext": parse_fulltext,
+    "segment": lambda token: parse_doubleword(token.strip()),
+}
+
+def handle_request(message: Any) -> dict:
+    if not isinstance(message, dict):
+        return {"error": f"Invalid request: expected an object, got {type(message).__name__}."}
+    command = message.get("command")
+    if (function := SERVER_COMMANDS.get(command)) is None:
+        return {"error": f"Unknown command {command!r}. Choose from {', '.join(SERVER_COMMANDS)}."}
+    try:
+        return {"result": function(message.get("text", ""))}
+    except Exception as error:
+        return {"error": f"{type(error).__name__}: {error}"}
+
+class VocabularyRequestHandler(socketserver.StreamRequestHandler):
+
+    def handle(self):
+        for line in self.rfile:
+            try:
+                response = handle_request(decode_message(line))
+            except ValueError as error:
+                response = {"error": f"Invalid request: {error}"}
+            self.wfile.write(encode_message(response))
+            self.wfile.flush()
+
+class VocabularyServer(socketserver.ThreadingUnixStreamServer):
+
+    daemon_threads = True
+
+    def __init__(self, socket_path: str = DEFAULT_SOCKET_PATH):
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+        self.socket_path = socket_path
+        super().__init__(socket_path, VocabularyRequestHandler)
+
+    def server_close(self):
+        super().server_close()
+        if os.path.exists(self.socket_path):
+            os.remove(self.socket_path)
+
+def serve(socket_path: str = DEFAULT_SOCKET_PATH):
+    with VocabularyServer(socket_path) as server:
+        print(f"Serving on {socket_path!r}.")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            print("Stopped serving.")
+
+if __name__ == "__main__":
+    serve()
@@ -0,0 +1,137 @@
+from collections import Counter
+from itertools import repeat
+
+import numpy as np
+from scipy import sparse
+from scipy.sparse.csgraph import connected_components
+
+from src.constants import (
+    MAX_DOCUMENT_FREQUENCY_RATIO,
+    MIN_DOCUMENTS_FOR_FREQUENCY_CUTOFF,
+    MAX_DOCUMENT_TERMS,
+    SIMILARITY_NEIGHBOURS,
+    SIMILARITY_BLOCK_SIZE,
+    CLUSTER_THRESHOLD,
+)
+
+class SimilarityIndex:
+
+    def __init__(self, document_word_counts: dict[str, Counter],
+                 max_document_frequency_ratio: float = MAX_DOCUMENT_FREQUENCY_RATIO,
+                 max_document_terms: int = MAX_DOCUMENT_TERMS):
+        self._documents = sorted(document_word_counts)
+        self._document_ids = {filename: i for i, filename in enumerate(self._documents)}
+        self._max_document_terms = max_document_terms
+        n_documents = len(self._documents)
+
+        document_frequencies = Counter()
+        for word_counts in document_word_counts.values():
+            document_frequencies.update(word_counts.keys())
+        if n_documents < MIN_DOCUMENTS_FOR_FREQUENCY_CUTOFF:
+            max_document_frequency = n_documents
+        else:
+            max_document_frequency = max(max_document_frequency_ratio * n_documents, 2)
+        self._words = sorted(
+            word for word, document_frequency in document_frequencies.items()
+            if document_frequency <= max_document_frequency
+        )
+        self._word_ids = {word: i for i, word in enumerate(self._words)}
+        self._idfs = np.log(
+            (1 + n_documents)
+            / (1 + np.array([document_frequencies[word] for word in self._words], dtype=float))
+        ) + 1
+
+        self._matrix = self.get_weighted_matrix(
+            [document_word_counts[filename] for filename in self._documents]
+        )
+        self._transposed_matrix = self._matrix.T.tocsr()
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    @property
+    def documents(self) -> list[str]:
+        return self._documents
+
+    def get_weighted_matrix(self, word_counts_list: list[Counter]) -> sparse.csr_matrix:
+        rows, columns, weights = [], [], []
+        for row, word_counts in enumerate(word_counts_list):
+            word_ids = np.fromiter(
+                map(self._word_ids.get, word_counts.keys(), repeat(-1)), 
+                dtype=np.int64, count=len(word_counts)
+            )
+            counts = np.fromiter(word_counts.values(), dtype=float, count=len(word_counts))
+            mask = (word_ids >= 0) & (counts > 0)
+            word_ids, counts = word_ids[mask], counts[mask]
+            row_weights = (1 + np.log(counts)) * self._idfs[word_ids]
+            if len(row_weights) > self._max_document_terms:
+                top_terms = np.argpartition(-row_weights, self._max_document_terms - 1)
+                top_terms = top_terms[:self._max_document_terms]
+                word_ids, row_weights = word_ids[top_terms], row_weights[top_terms]
+            norm = np.sqrt(np.dot(row_weights, row_weights)) or 1.0
+
+            rows.append(np.full(len(word_ids), row))
+            columns.append(word_ids)
+            weights.append(row_weights / norm)
+
+        shape = (len(word_counts_list), len(self._words))
+        if not rows:
+            return sparse.csr_matrix(shape)
+        return sparse.csr_matrix(
+            (np.concatenate(weights), (np.concatenate(rows), np.concatenate(columns))), 
+            shape=shape
+        )
+
+    def get_block_scores(self, start: int, stop: int) -> np.ndarray:
+        scores = (self._matrix[start:stop] @ self._transposed_matrix).toarray()
+        scores[np.arange(stop - start), np.arange(start, stop)] = 0.0
+        return scores
+
+    def get_top_neighbours(self, scores: np.ndarray, n: int) -> list[tuple[str, float]]:
+        n = min(n, len(scores))
+        top_ids = np.argpartition(-scores, n - 1)[:n]
+        top_ids = top_ids[np.argsort(-scores[top_ids])]
+        return [
+            (self._documents[top_id], float(scores[top_id]))
+            for top_id in top_ids if scores[top_id] > 0
+        ]
+
+    def get_nearest(self, filename: str, n: int = SIMILARITY_NEIGHBOURS) -> list[tuple[str, float]]:
+        document_id = self._document_ids[filename]
+        return self.get_top_neighbours(self.get_block_scores(document_id, document_id + 1)[0], n)
+
+    def get_nearest_to_counts(self, word_counts: Counter,
+                              n: int = SIMILARITY_NEIGHBOURS) -> list[tuple[str, float]]:
+        query = self.get_weighted_matrix([word_counts])
+        scores = (query @ self._transposed_matrix).toarray()[0]
+        return self.get_top_neighbours(scores, n)
+
+    def get_similarity_matrix(self, n: int = SIMILARITY_NEIGHBOURS) -> dict[str, dict[str, float]]:
+        similarity_matrix = {}
+        for start in range(0, len(self._documents), SIMILARITY_BLOCK_SIZE):
+            stop = min(start + SIMILARITY_BLOCK_SIZE, len(self._documents))
+            block_scores = self.get_block_scores(start, stop)
+            for offset, scores in enumerate(block_scores):
+                similarity_matrix[self._documents[start + offset]] = dict(
+                    self.get_top_neighbours(scores, n)
+                )
+        return similarity_matrix
+
+    def get_clusters(self, threshold: float = CLUSTER_THRESHOLD,
+                     n: int = SIMILARITY_NEIGHBOURS) -> list[list[str]]:
+        rows, columns = [], []
+        for filename, neighbours in self.get_similarity_matrix(n).items():
+            for neighbour, score in neighbours.items():
+                if score >= threshold:
+                    rows.append(self._document_ids[filename])
+                    columns.append(self._document_ids[neighbour])
+
+        n_documents = len(self._documents)
+        graph = sparse.csr_matrix(
+            (np.ones(len(rows)), (rows, columns)), shape=(n_documents, n_documents)
+        )
+        _, labels = connected_components(graph, directed=False)
+        clusters: dict[int, list[str]] = {}
+        for filename, label in zip(self._documents, labels):
+            clusters.setdefault(label, []).append(filename)
+        return sorted(clusters.values(), key=lambda cluster: (-len(cluster), cluster[0]))
@@ -1,6 +1,8 @@
 import os
 import sys
 import threading
+from collections import Counter
+from typing import Generator, Optional
 
 import time
 
@@ -10,7 +12,6 @@ from src.constants import (
     FILENAME_SEPARATOR,
     GPT_PREFIX,
     GPT_SUFFIX,
-    POINT_PREFIX,
     FOLDER_DIR,
     POINT_SUFFIX,
     PROGRESS_BAR_LENGTH,
@@ -22,6 +23,8 @@ from src.constants import (
     BACKWARD_KEYS,
     MAX_GPT_CHARACTERS,
     GPT_SEPARATOR,
+    FILTER_DUPLICATE_POINTS,
+    LLR_MEASURE,
 )
 from src.patterns import LINE_SPLIT_PATTERN
 from src.processing import (
@@ -32,9 +35,17 @@ from src.processing import (
     get_txt_filename,
     get_file_count,
     get_points_output_filepath,
+    get_index_filepath,
+    make_index_files_directory,
 )
-from src.parsing import parse_fulltext, parse_text
+from src.parsing import count_parsed_words, parse_text, parse_fulltext_lines
 from src.document import DocumentProcessor
+from src.index import InvertedIndex, index_words
+from src.duplicates import format_point_line, load_duplicate_filter
+from src.cache import parse_fulltext_cached
+from src.ngrams import BigramCounter
+from src.mapped import count_mapped_words, index_mapped_words, index_txt_file
+from src.pipeline import Stage
 from src.points import PointCLI, PointList
 
 class TextProcessor(DocumentProcessor):
@@ -45,6 +56,7 @@ class TextProcessor(DocumentProcessor):
         if not os.path.isdir(self._txt_folder_path):
             os.mkdir(self._txt_folder_path)
         self._total_file_count = get_file_count(self._txt_folder_path)
+        self._word_index: Optional[InvertedIndex] = None
 
     def txt_files(self) -> str:
         return list(self._filename_generator())
@@ -55,13 +67,80 @@ class TextProcessor(DocumentProcessor):
     def process_file(self, filename: str):
         self._file_count += 1
         print(f"Processing file {self._file_count}/{self._total_file_count}")
-        formatted_text = self.get_txt_file_text(filename)
-        words = self.parse_text(formatted_text)
-        self.add_word_counts(words)
+        filepath = self.get_txt_file_path(filename)
+        self.persist_word_counts((filename, index_txt_file(filepath)))
+
+    def persist_word_counts(self, item: tuple[str, tuple[Counter, dict[str, list[int]]]]):
+        filename, (words, word_positions) = item
+        self.add_word_counts(words, filename)
+        if self._word_index is not None:
+            self._word_index.add_document(filename, word_positions)
+
+    def count_collocations(self, n: int = 20, measure: str = LLR_MEASURE,
+                           use_sketch: bool = False) -> list[tuple[str, int, float]]:
+        bigram_counter = BigramCounter(use_sketch=use_sketch)
+        for filename in self._filename_generator():
+            bigram_counter.add_text(self.get_txt_file_text(filename))
+        return bigram_counter.get_collocations(n, measure)
+
+    def get_pipeline_stages(self) -> list[Stage]:
+        return [
+            Stage.configured("scan", lambda _: self.generate_txt_filepaths(), 
+                             keyed=False, fan_out=True),
+            Stage.configured("count", index_txt_file),
+            Stage.configured("persist", self.persist_word_counts, keyed=False),
+        ]
+
+    def generate_txt_filepaths(self) -> Generator[tuple[str, str], None, None]:
+        for filename in self._filename_generator():
+            yield filename, self.get_txt_file_path(filename)
+
+    def verify_mapped_word_counts(self) -> list[str]:
+        mismatched_files = []
+        for filename, filepath in self.generate_txt_filepaths():
+            if (mapped_counts := count_mapped_words(filepath)) is None:
+                continue
+            with open(filepath, newline="") as txt_file:
+                text = txt_file.read()
+            if mapped_counts != count_parsed_words(text, repair=False):
+                mismatched_files.append(filename)
+            elif index_mapped_words(filepath) != index_words(text, repair=False):
+                mismatched_files.append(filename)
+        return mismatched_files
+
+    def read_txt_file(self, filename: str) -> tuple[str, str]:
+        return filename, self.get_txt_file_text(filename)
+
+    def count_words(self, write_to_file: bool = True):
+        self._word_index = InvertedIndex(self._txt_folder_path)
+        super().count_words(write_to_file)
+        self.save_word_index()
+
+    def count_words_pipelined(self, write_to_file: bool = True, 
+                              report_interval: Optional[float] = None):
+        self._word_index = InvertedIndex(self._txt_folder_path)
+        super().count_words_pipelined(write_to_file, report_interval)
+        self.save_word_index()
+
+    def get_word_index(self) -> Optional[InvertedIndex]:
+        if self._word_index is None:
+            index_filepath = get_index_filepath(self._folder_name)
+            self._word_index = InvertedIndex.load(self._txt_folder_path, index_filepath)
+        return self._word_index
+
+    def save_word_index(self):
+        make_index_files_directory()
+        self._word_index.save(get_index_filepath(self._folder_name))
+
+    def concordance(self, word: str, n: int = 10) -> list[tuple[str, str]]:
+        if (word_index := self.get_word_index()) is None:
+            self.count_words(write_to_file=False)
+            word_index = self._word_index
+        return word_index.concordance(word, n)
     
     def write_point_to_file(self, point: str, filename: str):
         with open(filename, "a+") as points_file:
-            points_file.write(POINT_PREFIX + point + '\n')
+            points_file.write(format_point_line(point))
 
     def generate_txt_files(self):
         if not os.path.isdir(self._txt_folder_path):
@@ -71,11 +150,23 @@ class TextProcessor(DocumentProcessor):
             txt_file_name = get_txt_filename(pdf_file_name)
             txt_file_path = os.path.join(self._txt_folder_path, txt_file_name)
             if not os.path.exists(txt_file_path):
-                formatted_pdf_text = self.get_formatted_pdf_text(pdf_file_name)
-                with open(txt_file_path, "w") as txt_file:
-                    txt_file.write(formatted_pdf_text)
+                self.write_txt_file(pdf_file_name)
                 print("Created new text file entitled", txt_file_name)
 
+    def write_txt_file(self, pdf_file_name: str) -> str:
+        txt_file_name = get_txt_filename(pdf_file_name)
+        txt_file_path = os.path.join(self._txt_folder_path, txt_file_name)
+        formatted_pdf_text = self.get_formatted_pdf_text(pdf_file_name)
+        with open(txt_file_path, "w") as txt_file:
+            txt_file.write(formatted_pdf_text)
+        return txt_file_name
+
+    def update_word_counts(self, filename: str):
+        filepath = self.get_txt_file_path(filename)
+        self.persist_word_counts((filename, index_txt_file(filepath)))
+        if self._word_index is not None:
+            self.save_word_index()
+
     def gpt_divide_points(self, gpt_folder: str, filename: str):
         formatted_text = parse_text(self.get_txt_file_text(filename))
         file_points = LINE_SPLIT_PATTERN.split(formatted_text)
@@ -116,9 +207,20 @@ class PointProcessor(TextProcessor):
         if not self.has_generated_txt_files():
             self.generate_txt_files()
 
+    def get_profiled_stages(self) -> list[Stage]:
+        duplicate_filter = load_duplicate_filter() if FILTER_DUPLICATE_POINTS else None
+        stages = [
+            Stage("scan", lambda _: self._filename_generator(), keyed=False, fan_out=True),
+            Stage("read", self.read_txt_file, keyed=False),
+            Stage("parse", parse_fulltext_lines),
+        ]
+        if duplicate_filter is not None:
+            stages.append(Stage("filter", duplicate_filter.filter))
+        return stages
+
     def points(self, filename: str):
         assert is_txt(filename), "Must be a text file"
-        fulltext = parse_fulltext(self.get_txt_file_text(filename))
+        fulltext = parse_fulltext_cached(self.get_txt_file_text(filename))
         saved_filename = get_saved_points_filename(filename)
         points_output_filepath = get_points_output_filepath(saved_filename)
         point_list = PointList(fulltext)
@@ -0,0 +1,84 @@
+import os
+import time
+import threading
+from typing import Optional
+
+from src.constants import WATCH_POLL_INTERVAL, WATCH_SETTLE_TIME
+from src.processing import is_pdf, get_txt_filename
+from src.text import TextProcessor
+
+FileSignature = tuple[int, int]
+
+class FolderWatcher:
+
+    def __init__(self, processor: TextProcessor, poll_interval: float = WATCH_POLL_INTERVAL,
+                 settle_time: float = WATCH_SETTLE_TIME):
+        self._processor = processor
+        self._poll_interval = poll_interval
+        self._settle_time = settle_time
+        self._processed: dict[str, FileSignature] = {}
+        self._pending: dict[str, tuple[FileSignature, float]] = {}
+
+    def get_pdf_signatures(self) -> dict[str, FileSignature]:
+        signatures = {}
+        with os.scandir(self._processor.folder_path) as entries:
+            for entry in entries:
+                if is_pdf(entry.name) and entry.is_file():
+                    file_stat = entry.stat()
+                    signatures[entry.name] = (file_stat.st_size, file_stat.st_mtime_ns)
+        return signatures
+
+    def load_existing_files(self):
+        for pdf_filename, signature in self.get_pdf_signatures().items():
+            txt_filepath = os.path.join(
+                self._processor.txt_folder_path, get_txt_filename(pdf_filename)
+            )
+            if os.path.exists(txt_filepath) and os.stat(txt_filepath).st_mtime_ns >= signature[1]:
+                self._processed[pdf_filename] = signature
+        self._processor.count_words(write_to_file=False)
+
+    def get_settled_files(self) -> list[str]:
+        now = time.monotonic()
+        settled_files = []
+        for pdf_filename, signature in self.get_pdf_signatures().items():
+            if self._processed.get(pdf_filename) == signature:
+                continue
+
+            pending_signature, first_seen_time = self._pending.get(pdf_filename, (None, now))
+            if pending_signature != signature:
+                self._pending[pdf_filename] = (signature, now)
+            elif now - first_seen_time >= self._settle_time:
+                settled_files.append(pdf_filename)
+        return settled_files
+
+    def process_file(self, pdf_filename: str) -> bool:
+        signature, _ = self._pending.pop(pdf_filename)
+        try:
+            txt_filename = self._processor.write_txt_file(pdf_filename)
+        except Exception as error:
+            print(f"Could not extract {pdf_filename!r}, retrying: {error}")
+            return False
+
+        self._processor.update_word_counts(txt_filename)
+        self._processed[pdf_filename] = signature
+        n_words = sum(self._processor.get_document_word_counts(txt_filename).values())
+        n_total_words = sum(self._processor.get_word_counts().values())
+        print(f"Updated counts from {pdf_filename!r} ({n_words} words, {n_total_words} total)")
+        return True
+
+    def poll(self) -> list[str]:
+        return [
+            pdf_filename for pdf_filename in self.get_settled_files()
+            if self.process_file(pdf_filename)
+        ]
+
+    def watch(self, stop_event: Optional[threading.Event] = None):
+        stop_event = stop_event or threading.Event()
+        self.load_existing_files()
+        print(f"Watching {self._processor.folder_path!r} for new PDFs.")
+        try:
+            while not stop_event.is_set():
+                self.poll()
+                stop_event.wait(self._poll_interval)
+        except KeyboardInterrupt:
+            print("Stopped watching.")